@@ -9,21 +9,37 @@ Usage:
     python meta_agent.py --example technical_specialist
 """
 
-import yaml
+import os
+import sys
 import json
 import argparse
+import copy
+import functools
 from dataclasses import dataclass, field
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 from enum import Enum
-from jinja2 import Environment, DictLoader
 import re
 
+# Slotted dataclasses need Python 3.10+. The stdlib decorator is kept on purpose:
+# code-object-caching replacements such as dataklasses support neither slots
+# nor field(default_factory=...), which AgentRequirements relies on.
+_DATACLASS_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
 class ExpertiseLevel(Enum):
     BEGINNER = "beginner"
     INTERMEDIATE = "intermediate"
     ADVANCED = "advanced"
     EXPERT = "expert"
 
+# Small int per expertise level, in declaration order, for tuple-indexed lookups
+for _idx, _level in enumerate(ExpertiseLevel):
+    _level._idx = _idx
+del _idx, _level
+
+# Indexed by ExpertiseLevel._idx
+EXPERIENCE_YEARS = ("1-2", "3-5", "6-10", "10+")
+COMPLEXITY_BY_LEVEL = (1, 2, 3, 4)
+
 class TeamContext(Enum):
     SOLO = "solo"
     COLLABORATIVE = "collaborative"
@@ -34,7 +50,7 @@ class SafetyLevel(Enum):
     MEDIUM = "medium"
     HIGH = "high"
 
-@dataclass
+@dataclass(**_DATACLASS_SLOTS)
 class Tool:
     name: str
     description: str
@@ -42,28 +58,28 @@ class Tool:
     validation_requirements: str = ""
     error_procedures: str = "Log error and continue with alternative approach"
 
-@dataclass
+@dataclass(**_DATACLASS_SLOTS)
 class Competency:
     name: str
     description: str
     techniques: List[str] = field(default_factory=list)
     standards: List[str] = field(default_factory=list)
 
-@dataclass
+@dataclass(**_DATACLASS_SLOTS)
 class DecisionScenario:
     name: str
     approach: str
     considerations: List[str] = field(default_factory=list)
     success_criteria: List[str] = field(default_factory=list)
 
-@dataclass
+@dataclass(**_DATACLASS_SLOTS)
 class QualityStandard:
     name: str
     description: str
     measurement_method: str
     threshold: str
 
-@dataclass
+@dataclass(**_DATACLASS_SLOTS)
 class AgentRequirements:
     # Basic Information
     role: str
@@ -110,11 +126,11 @@ You are {{role}}, a {{expertise_level.value}} in {{domain}}.
 ## Purpose and Scope
 Your primary purpose is to {{primary_purpose}}.
 
-{% if team_context != TeamContext.SOLO %}
+{% if is_team %}
 ## Team Integration
-{% if team_context == TeamContext.COLLABORATIVE %}
+{% if is_collaborative %}
 You work as part of a collaborative team where agents coordinate as equals, sharing information and delegating tasks based on expertise and availability.
-{% elif team_context == TeamContext.HIERARCHICAL %}
+{% elif is_hierarchical %}
 You operate within a hierarchical structure with clear reporting lines and delegation protocols.
 {% endif %}
 {% endif %}''',
@@ -235,7 +251,7 @@ Limit reasoning chains to {{max_reasoning_steps}} steps. If a solution requires
 **Completion**: "Completed [task] - Results: [summary] - Quality: [validation_status]"
 **Issues**: "Blocked on [task] - Issue: [description] - Escalating to [target]"
 
-{% if team_context != TeamContext.SOLO %}
+{% if is_team %}
 ### Handoff Protocols
 **When delegating tasks**:
 - "Passing [task] to [target_agent] because [reason]"
@@ -263,13 +279,13 @@ Escalate to human oversight when:
         'safety_constraints': '''## Safety and Operational Constraints
 
 ### Safety Boundaries
-{% if safety_level == SafetyLevel.HIGH %}
+{% if safety_high %}
 **Critical Safety Requirements**:
 - Never perform actions that could cause system damage
 - Always validate potentially destructive operations
 - Require explicit confirmation for high-risk actions
 - Maintain comprehensive audit logs
-{% elif safety_level == SafetyLevel.MEDIUM %}
+{% elif safety_medium %}
 **Standard Safety Requirements**:
 - Validate inputs and outputs for safety
 - Avoid potentially harmful operations
@@ -351,25 +367,80 @@ Always end responses with:
 - **Confidence**: [HIGH/MEDIUM/LOW] 
 - **Validation**: [PASSED/FAILED/PENDING]'''
     }
+    
+    # Joins section names into the name of a composite template
+    COMPOSITE_SEPARATOR = '+'
 
-    def __init__(self):
-        self.env = Environment(loader=DictLoader(self.TEMPLATES))
-        # Add enum comparisons to Jinja2 environment
-        self.env.globals['TeamContext'] = TeamContext
-        self.env.globals['SafetyLevel'] = SafetyLevel
-        self.env.globals['ExpertiseLevel'] = ExpertiseLevel
+    def _shared(self) -> Dict[str, Any]:
+        """Environment and compiled templates, shared by every instance of the class"""
+        cls = type(self)
+        if '_shared_state' not in cls.__dict__:
+            cls._shared_state = {'env': self._build_env(), 'templates': {}}
+        return cls._shared_state
+    
+    def _build_env(self):
+        """Jinja2 environment, built on first use so importing jinja2 is deferred"""
+        from jinja2 import Environment, FunctionLoader, FileSystemBytecodeCache
+        
+        # TEMPLATES is static, so skip mtime checks and never evict from the cache.
+        # Compiled bytecode is persisted so warm runs skip parsing and codegen. Without
+        # an explicit directory Jinja uses a private per-user (0700, owner-checked) one.
+        # Jinja's cache key ignores whitespace options, so they are part of the pattern.
+        # The cache is only an optimization: if Jinja cannot find a safe directory
+        # (e.g. another user already owns it), render without one.
+        try:
+            bytecode_cache = FileSystemBytecodeCache(pattern='__meta_agent_trim_lstrip_%s.cache')
+        except (OSError, RuntimeError):
+            bytecode_cache = None
+        return Environment(
+            loader=FunctionLoader(self._load_source),
+            bytecode_cache=bytecode_cache,
+            auto_reload=False,
+            cache_size=-1,
+            # Drop the newline after block tags and the indentation before them
+            trim_blocks=True,
+            lstrip_blocks=True
+        )
+    
+    @property
+    def env(self):
+        """Shared Jinja2 environment"""
+        return self._shared()['env']
+    
+    def _load_source(self, name: str) -> Optional[str]:
+        """Resolve a single template name, or a composite of names joined by COMPOSITE_SEPARATOR"""
+        names = name.split(self.COMPOSITE_SEPARATOR)
+        if not all(n in self.TEMPLATES for n in names):
+            return None
+        return '\n\n'.join(self.TEMPLATES[n] for n in names)
+    
+    def composite(self, template_names: List[str]):
+        """Single template rendering the given sections in order, separated by blank lines"""
+        templates = self._shared()['templates']
+        key = tuple(template_names)
+        template = templates.get(key)
+        if template is None:
+            # Only the first request for a section combination goes through the loader
+            template = templates[key] = self.env.get_template(self.COMPOSITE_SEPARATOR.join(key))
+        return template
 
 class QualityValidator:
     """Validates generated system messages against best practices"""
     
+    # Static keywords each rule looks for (already lowercase)
+    _REQUIRED_PRINCIPLES = ('helpfulness', 'harmlessness', 'honesty', 'transparency')
+    _REASONING_PATTERNS = ('thought:', 'action:', 'observation:', 'analysis', 'planning')
+    _SAFETY_KEYWORDS = ('safety', 'error handling', 'escalation', 'validation', 'constraints')
+    _COMM_ELEMENTS = ('communication', 'reporting', 'status', 'format')
+    
     def __init__(self):
-        self.validation_rules = [
-            self._check_constitutional_compliance,
-            self._check_role_clarity,
-            self._check_reasoning_structure,
-            self._check_safety_constraints,
-            self._check_communication_protocols
-        ]
+        self.validation_rules = (
+            ('constitutional_compliance', self._check_constitutional_compliance),
+            ('role_clarity', self._check_role_clarity),
+            ('reasoning_structure', self._check_reasoning_structure),
+            ('safety_constraints', self._check_safety_constraints),
+            ('communication_protocols', self._check_communication_protocols)
+        )
     
     def validate(self, system_message: str, requirements: AgentRequirements) -> Dict[str, Any]:
         """Run all validation checks"""
@@ -379,9 +450,10 @@ class QualityValidator:
             'suggestions': []
         }
         
-        for rule in self.validation_rules:
-            check_name = rule.__name__.replace('_check_', '')
-            check_result = rule(system_message, requirements)
+        message_lower = system_message.lower()
+        
+        for check_name, rule in self.validation_rules:
+            check_result = rule(message_lower, requirements)
             results['checks'][check_name] = check_result
             
             if not check_result['passed']:
@@ -390,14 +462,9 @@ class QualityValidator:
         
         return results
     
-    def _check_constitutional_compliance(self, message: str, requirements: AgentRequirements) -> Dict[str, Any]:
+    def _check_constitutional_compliance(self, message_lower: str, requirements: AgentRequirements) -> Dict[str, Any]:
         """Check for constitutional AI principles"""
-        required_principles = ['helpfulness', 'harmlessness', 'honesty', 'transparency']
-        found_principles = []
-        
-        for principle in required_principles:
-            if principle.lower() in message.lower():
-                found_principles.append(principle)
+        found_principles = [principle for principle in self._REQUIRED_PRINCIPLES if principle in message_lower]
         
         passed = len(found_principles) >= 3  # Require at least 3 of 4 principles
         
@@ -407,13 +474,13 @@ class QualityValidator:
             'suggestions': [] if passed else ['Add explicit constitutional principles section']
         }
     
-    def _check_role_clarity(self, message: str, requirements: AgentRequirements) -> Dict[str, Any]:
+    def _check_role_clarity(self, message_lower: str, requirements: AgentRequirements) -> Dict[str, Any]:
         """Check for clear role definition"""
-        has_role = requirements.role.lower() in message.lower()
-        has_domain = requirements.domain.lower() in message.lower()
-        has_purpose = 'purpose' in message.lower()
+        has_role = requirements.role.lower() in message_lower
+        has_domain = requirements.domain.lower() in message_lower
+        has_purpose = 'purpose' in message_lower
         
-        clarity_score = sum([has_role, has_domain, has_purpose])
+        clarity_score = has_role + has_domain + has_purpose
         passed = clarity_score >= 2
         
         suggestions = []
@@ -430,10 +497,9 @@ class QualityValidator:
             'suggestions': suggestions
         }
     
-    def _check_reasoning_structure(self, message: str, requirements: AgentRequirements) -> Dict[str, Any]:
+    def _check_reasoning_structure(self, message_lower: str, requirements: AgentRequirements) -> Dict[str, Any]:
         """Check for structured reasoning approach"""
-        reasoning_patterns = ['thought:', 'action:', 'observation:', 'analysis', 'planning']
-        found_patterns = sum(1 for pattern in reasoning_patterns if pattern.lower() in message.lower())
+        found_patterns = sum(1 for pattern in self._REASONING_PATTERNS if pattern in message_lower)
         
         passed = found_patterns >= 2
         
@@ -443,10 +509,9 @@ class QualityValidator:
             'suggestions': [] if passed else ['Add structured reasoning framework']
         }
     
-    def _check_safety_constraints(self, message: str, requirements: AgentRequirements) -> Dict[str, Any]:
+    def _check_safety_constraints(self, message_lower: str, requirements: AgentRequirements) -> Dict[str, Any]:
         """Check for appropriate safety constraints"""
-        safety_keywords = ['safety', 'error handling', 'escalation', 'validation', 'constraints']
-        found_keywords = sum(1 for keyword in safety_keywords if keyword.lower() in message.lower())
+        found_keywords = sum(1 for keyword in self._SAFETY_KEYWORDS if keyword in message_lower)
         
         required_safety_level = 2 if requirements.safety_level == SafetyLevel.HIGH else 1
         passed = found_keywords >= required_safety_level
@@ -457,10 +522,9 @@ class QualityValidator:
             'suggestions': [] if passed else ['Add more explicit safety constraints and procedures']
         }
     
-    def _check_communication_protocols(self, message: str, requirements: AgentRequirements) -> Dict[str, Any]:
+    def _check_communication_protocols(self, message_lower: str, requirements: AgentRequirements) -> Dict[str, Any]:
         """Check for clear communication protocols"""
-        comm_elements = ['communication', 'reporting', 'status', 'format']
-        found_elements = sum(1 for element in comm_elements if element.lower() in message.lower())
+        found_elements = sum(1 for element in self._COMM_ELEMENTS if element in message_lower)
         
         passed = found_elements >= 2
         
@@ -470,23 +534,26 @@ class QualityValidator:
             'suggestions': [] if passed else ['Add clear communication and reporting protocols']
         }
 
+# Whether generate_system_message validates by default; set META_AGENT_VALIDATE=0 to skip
+DEFAULT_VALIDATE = os.environ.get('META_AGENT_VALIDATE', '1').strip().lower() not in ('0', 'false', 'no', 'off')
+
 class MetaAgent:
     """Main meta-agent class for generating agent system messages"""
     
     def __init__(self):
         self.template_library = TemplateLibrary()
         self.validator = QualityValidator()
-        
-        # Experience years mapping based on expertise level
-        self.experience_mapping = {
-            ExpertiseLevel.BEGINNER: "1-2",
-            ExpertiseLevel.INTERMEDIATE: "3-5", 
-            ExpertiseLevel.ADVANCED: "6-10",
-            ExpertiseLevel.EXPERT: "10+"
-        }
     
-    def generate_system_message(self, requirements: AgentRequirements) -> Dict[str, Any]:
-        """Generate a complete system message based on requirements"""
+    def generate_system_message(self, requirements: AgentRequirements,
+                                validate: Optional[bool] = None) -> Dict[str, Any]:
+        """Generate a complete system message based on requirements
+        
+        Pass validate=False (or set META_AGENT_VALIDATE=0) when only the text is
+        needed, e.g. batch generation with its own downstream QA; 'validation'
+        is then None in the result.
+        """
+        if validate is None:
+            validate = DEFAULT_VALIDATE
         
         # Analyze requirements to determine which templates to use
         analysis = self._analyze_requirements(requirements)
@@ -494,20 +561,13 @@ class MetaAgent:
         # Select appropriate templates
         templates_to_use = self._select_templates(analysis)
         
-        # Generate each section
-        sections = []
+        # Render all sections in one pass
         template_context = self._build_template_context(requirements)
-        
-        for template_name in templates_to_use:
-            template = self.template_library.env.get_template(template_name)
-            section = template.render(**template_context)
-            sections.append(section)
-        
-        # Combine sections
-        system_message = '\n\n'.join(sections)
+        template = self.template_library.composite(templates_to_use)
+        system_message = template.render(**template_context)
         
         # Validate the generated message
-        validation_result = self.validator.validate(system_message, requirements)
+        validation_result = self.validator.validate(system_message, requirements) if validate else None
         
         return {
             'system_message': system_message,
@@ -518,48 +578,69 @@ class MetaAgent:
     
     def _analyze_requirements(self, requirements: AgentRequirements) -> Dict[str, Any]:
         """Analyze requirements to determine generation strategy"""
+        # Only these properties affect the analysis, so equivalent requirements share a cache entry
+        analysis = self._analyze_fingerprint(
+            requirements.expertise_level,
+            requirements.team_context,
+            requirements.safety_level,
+            min(len(requirements.tools_available), 3),
+            len(requirements.core_competencies) > 0
+        )
+        return dict(analysis)
+    
+    @staticmethod
+    @functools.lru_cache(maxsize=64)
+    def _analyze_fingerprint(expertise_level: ExpertiseLevel, team_context: TeamContext,
+                             safety_level: SafetyLevel, tool_count: int,
+                             has_competencies: bool) -> Dict[str, Any]:
+        """Cached analysis for one requirements fingerprint; callers must copy the result"""
         complexity_score = 0
         
         # Base complexity from expertise level
-        complexity_score += {
-            ExpertiseLevel.BEGINNER: 1,
-            ExpertiseLevel.INTERMEDIATE: 2,
-            ExpertiseLevel.ADVANCED: 3,
-            ExpertiseLevel.EXPERT: 4
-        }[requirements.expertise_level]
+        complexity_score += COMPLEXITY_BY_LEVEL[expertise_level._idx]
         
         # Add complexity for tools
-        complexity_score += min(len(requirements.tools_available), 3)
+        complexity_score += tool_count
         
         # Add complexity for team context
-        if requirements.team_context != TeamContext.SOLO:
+        if team_context != TeamContext.SOLO:
             complexity_score += 2
         
         # Add complexity for safety requirements
-        if requirements.safety_level == SafetyLevel.HIGH:
+        if safety_level == SafetyLevel.HIGH:
             complexity_score += 2
         
         return {
             'complexity_score': complexity_score,
-            'needs_specialization': len(requirements.core_competencies) > 0,
-            'needs_tool_integration': len(requirements.tools_available) > 0,
-            'needs_team_coordination': requirements.team_context != TeamContext.SOLO,
-            'needs_enhanced_safety': requirements.safety_level == SafetyLevel.HIGH
+            'needs_specialization': has_competencies,
+            'needs_tool_integration': tool_count > 0,
+            'needs_team_coordination': team_context != TeamContext.SOLO,
+            'needs_enhanced_safety': safety_level == SafetyLevel.HIGH
         }
     
     def _select_templates(self, analysis: Dict[str, Any]) -> List[str]:
         """Select which templates to use based on analysis"""
+        templates = self._templates_for(
+            analysis['needs_specialization'] or analysis['complexity_score'] >= 3,
+            analysis['needs_tool_integration']
+        )
+        return list(templates)
+    
+    @staticmethod
+    @functools.lru_cache(maxsize=None)
+    def _templates_for(needs_specialization: bool, needs_tool_integration: bool) -> Tuple[str, ...]:
+        """Cached template selection; only these two flags change the result"""
         templates = ['constitutional_base']  # Always include constitutional foundation
         
         # Add specialization if needed
-        if analysis['needs_specialization'] or analysis['complexity_score'] >= 3:
+        if needs_specialization:
             templates.append('role_specialization')
         
         # Always add reasoning structure
         templates.append('reasoning_structure')
         
         # Add tool integration if tools are available
-        if analysis['needs_tool_integration']:
+        if needs_tool_integration:
             templates.append('tool_integration')
         
         # Always add communication protocols
@@ -571,7 +652,7 @@ class MetaAgent:
         # Always add output formatting
         templates.append('output_formatting')
         
-        return templates
+        return tuple(templates)
     
     def _build_template_context(self, requirements: AgentRequirements) -> Dict[str, Any]:
         """Build context dictionary for template rendering"""
@@ -600,15 +681,28 @@ class MetaAgent:
             'safety_level': requirements.safety_level,
             
             # Derived values
-            'experience_years': self.experience_mapping[requirements.expertise_level]
+            'experience_years': EXPERIENCE_YEARS[requirements.expertise_level._idx],
+            
+            # Precomputed flags so templates test booleans instead of comparing enums
+            'is_team': requirements.team_context != TeamContext.SOLO,
+            'is_collaborative': requirements.team_context == TeamContext.COLLABORATIVE,
+            'is_hierarchical': requirements.team_context == TeamContext.HIERARCHICAL,
+            'safety_high': requirements.safety_level == SafetyLevel.HIGH,
+            'safety_medium': requirements.safety_level == SafetyLevel.MEDIUM
         }
         
         return context
 
 def load_config_from_yaml(file_path: str) -> AgentRequirements:
-    """Load agent requirements from YAML file"""
-    with open(file_path, 'r') as f:
-        config = yaml.safe_load(f)
+    """Load agent requirements from YAML file
+    
+    Parsed files are cached per resolved path, modification time and size;
+    every call still returns a new AgentRequirements instance.
+    """
+    real_path = os.path.realpath(file_path)
+    stat = os.stat(real_path)
+    # Copy the cached parse so callers can never mutate it through the result
+    config = copy.deepcopy(_parse_yaml_config(real_path, stat.st_mtime_ns, stat.st_size))
     
     # Convert tools
     tools = []
@@ -648,199 +742,257 @@ def load_config_from_yaml(file_path: str) -> AgentRequirements:
     
     return requirements
 
-def create_example_configs():
-    """Create example configuration files for different agent types"""
-    
-    # Technical Specialist Example
-    technical_config = {
-        'role': 'Senior Python Developer',
-        'domain': 'Software Development',
-        'expertise_level': 'expert',
-        'primary_purpose': 'Develop, review, and optimize Python applications with focus on code quality, performance, and maintainability',
-        'team_context': 'collaborative',
-        'work_environment': 'agile_development',
-        'primary_tasks': [
-            'Code review and optimization',
-            'Architecture design and documentation',
-            'Performance analysis and tuning',
-            'Mentoring junior developers',
-            'Technical decision making'
-        ],
-        'tools_available': [
-            {
-                'name': 'code_analyzer',
-                'description': 'Static code analysis tool for Python',
-                'usage_conditions': 'When reviewing code quality, security, or performance',
-                'validation_requirements': 'Verify analysis results align with coding standards',
-                'error_procedures': 'Log analysis errors and perform manual review'
-            },
-            {
-                'name': 'test_runner',
-                'description': 'Automated testing framework',
-                'usage_conditions': 'When validating code changes or new features',
-                'validation_requirements': 'Ensure test coverage meets minimum thresholds',
-                'error_procedures': 'Report test failures and suggest fixes'
-            },
-            {
-                'name': 'documentation_generator',
-                'description': 'Automatic API documentation generation',
-                'usage_conditions': 'When documenting APIs or code interfaces',
-                'validation_requirements': 'Verify documentation completeness and accuracy',
-                'error_procedures': 'Generate manual documentation if auto-generation fails'
-            }
-        ],
-        'core_competencies': [
-            {
-                'name': 'Python Development',
-                'description': 'Advanced Python programming and best practices',
-                'techniques': ['Design patterns', 'OOP principles', 'Functional programming', 'Async programming'],
-                'standards': ['PEP 8 compliance', 'Type hints usage', 'Docstring conventions']
-            },
-            {
-                'name': 'Code Quality Assurance',
-                'description': 'Ensuring high-quality, maintainable code',
-                'techniques': ['Static analysis', 'Code reviews', 'Refactoring', 'Testing strategies'],
-                'standards': ['80% test coverage minimum', 'Cyclomatic complexity < 10', 'No critical security issues']
-            },
-            {
-                'name': 'Performance Optimization',
-                'description': 'Identifying and resolving performance bottlenecks',
-                'techniques': ['Profiling', 'Caching strategies', 'Algorithm optimization', 'Database tuning'],
-                'standards': ['Response time < 200ms', 'Memory usage within limits', 'Scalability benchmarks']
-            }
-        ],
-        'safety_level': 'high',
-        'max_tool_calls': 15,
-        'max_reasoning_steps': 25,
-        'communication_style': 'technical_professional',
-        'output_format': 'structured_markdown',
-        'escalation_conditions': [
-            'Security vulnerabilities detected',
-            'Breaking changes required',
-            'Requirements unclear or conflicting',
-            'Resource constraints prevent completion'
-        ],
-        'quality_standards': [
-            {
-                'name': 'Code Quality',
-                'description': 'All code must meet quality standards',
-                'measurement_method': 'Static analysis score and review checklist',
-                'threshold': 'Grade A or higher'
-            },
-            {
-                'name': 'Test Coverage',
-                'description': 'Adequate test coverage for reliability',
-                'measurement_method': 'Automated coverage analysis',
-                'threshold': 'Minimum 80% line coverage'
-            }
-        ],
-        'domain_standards': [
-            'PEP 8 style guide compliance',
-            'Python 3.9+ compatibility',
-            'Type hints for all public APIs',
-            'Comprehensive docstrings for modules and functions'
-        ]
-    }
+@functools.lru_cache(maxsize=32)
+def _parse_yaml_config(file_path: str, mtime_ns: int, size: int) -> Dict[str, Any]:
+    """Parse a YAML config; mtime_ns and size are only part of the cache key"""
+    return read_yaml_config(file_path)
+
+def read_yaml_config(file_path: str) -> Dict[str, Any]:
+    """Parse a YAML config file into a plain dict, without caching"""
+    import yaml
     
-    # Creative Professional Example
-    creative_config = {
-        'role': 'Content Strategist',
-        'domain': 'Content Creation',
-        'expertise_level': 'advanced',
-        'primary_purpose': 'Create compelling, engaging content that resonates with target audiences and achieves business objectives',
-        'team_context': 'collaborative',
-        'work_environment': 'creative_agency',
-        'primary_tasks': [
-            'Content strategy development',
-            'Creative brief creation',
-            'Content editing and optimization',
-            'Brand voice development',
-            'Campaign ideation'
-        ],
-        'tools_available': [
-            {
-                'name': 'content_analyzer',
-                'description': 'Analyzes content performance and engagement metrics',
-                'usage_conditions': 'When evaluating content effectiveness or planning optimization',
-                'validation_requirements': 'Cross-reference with business objectives',
-                'error_procedures': 'Use manual analysis and industry benchmarks'
-            },
-            {
-                'name': 'brand_voice_checker',
-                'description': 'Validates content against brand voice guidelines',
-                'usage_conditions': 'Before finalizing any customer-facing content',
-                'validation_requirements': 'Ensure alignment with brand personality',
-                'error_procedures': 'Manual review against brand guidelines'
-            }
-        ],
-        'core_competencies': [
-            {
-                'name': 'Strategic Content Planning',
-                'description': 'Developing content strategies aligned with business goals',
-                'techniques': ['Audience research', 'Content mapping', 'Editorial calendars', 'Performance analysis'],
-                'standards': ['Clear success metrics', 'Audience-focused approach', 'Brand alignment']
-            },
-            {
-                'name': 'Creative Development',
-                'description': 'Creating original, engaging content concepts',
-                'techniques': ['Brainstorming', 'Ideation frameworks', 'Creative brief development', 'Concept testing'],
-                'standards': ['Original concepts', 'Brand-appropriate tone', 'Target audience relevance']
-            }
-        ],
-        'safety_level': 'medium',
-        'max_tool_calls': 8,
-        'max_reasoning_steps': 15,
-        'communication_style': 'creative_professional',
-        'output_format': 'structured_text',
-        'escalation_conditions': [
-            'Content conflicts with brand guidelines',
-            'Legal or compliance concerns',
-            'Client feedback requires major strategic changes'
-        ],
-        'quality_standards': [
-            {
-                'name': 'Brand Alignment',
-                'description': 'Content must align with brand voice and values',
-                'measurement_method': 'Brand voice checker and manual review',
-                'threshold': '95% alignment score'
-            }
-        ],
-        'domain_standards': [
-            'AP Style Guide compliance',
-            'Brand voice consistency',
-            'SEO best practices integration',
-            'Accessibility guidelines adherence'
-        ]
-    }
+    # Prefer the libyaml-backed loader when PyYAML was built with it
+    loader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+    # Binary mode lets libyaml read the UTF-8 bytes directly without a text decode
+    with open(file_path, 'rb') as f:
+        return yaml.load(f, Loader=loader)
+
+# Technical Specialist Example
+_TECHNICAL_CONFIG = {
+    'role': 'Senior Python Developer',
+    'domain': 'Software Development',
+    'expertise_level': 'expert',
+    'primary_purpose': 'Develop, review, and optimize Python applications with focus on code quality, performance, and maintainability',
+    'team_context': 'collaborative',
+    'work_environment': 'agile_development',
+    'primary_tasks': [
+        'Code review and optimization',
+        'Architecture design and documentation',
+        'Performance analysis and tuning',
+        'Mentoring junior developers',
+        'Technical decision making'
+    ],
+    'tools_available': [
+        {
+            'name': 'code_analyzer',
+            'description': 'Static code analysis tool for Python',
+            'usage_conditions': 'When reviewing code quality, security, or performance',
+            'validation_requirements': 'Verify analysis results align with coding standards',
+            'error_procedures': 'Log analysis errors and perform manual review'
+        },
+        {
+            'name': 'test_runner',
+            'description': 'Automated testing framework',
+            'usage_conditions': 'When validating code changes or new features',
+            'validation_requirements': 'Ensure test coverage meets minimum thresholds',
+            'error_procedures': 'Report test failures and suggest fixes'
+        },
+        {
+            'name': 'documentation_generator',
+            'description': 'Automatic API documentation generation',
+            'usage_conditions': 'When documenting APIs or code interfaces',
+            'validation_requirements': 'Verify documentation completeness and accuracy',
+            'error_procedures': 'Generate manual documentation if auto-generation fails'
+        }
+    ],
+    'core_competencies': [
+        {
+            'name': 'Python Development',
+            'description': 'Advanced Python programming and best practices',
+            'techniques': ['Design patterns', 'OOP principles', 'Functional programming', 'Async programming'],
+            'standards': ['PEP 8 compliance', 'Type hints usage', 'Docstring conventions']
+        },
+        {
+            'name': 'Code Quality Assurance',
+            'description': 'Ensuring high-quality, maintainable code',
+            'techniques': ['Static analysis', 'Code reviews', 'Refactoring', 'Testing strategies'],
+            'standards': ['80% test coverage minimum', 'Cyclomatic complexity < 10', 'No critical security issues']
+        },
+        {
+            'name': 'Performance Optimization',
+            'description': 'Identifying and resolving performance bottlenecks',
+            'techniques': ['Profiling', 'Caching strategies', 'Algorithm optimization', 'Database tuning'],
+            'standards': ['Response time < 200ms', 'Memory usage within limits', 'Scalability benchmarks']
+        }
+    ],
+    'safety_level': 'high',
+    'max_tool_calls': 15,
+    'max_reasoning_steps': 25,
+    'communication_style': 'technical_professional',
+    'output_format': 'structured_markdown',
+    'escalation_conditions': [
+        'Security vulnerabilities detected',
+        'Breaking changes required',
+        'Requirements unclear or conflicting',
+        'Resource constraints prevent completion'
+    ],
+    'quality_standards': [
+        {
+            'name': 'Code Quality',
+            'description': 'All code must meet quality standards',
+            'measurement_method': 'Static analysis score and review checklist',
+            'threshold': 'Grade A or higher'
+        },
+        {
+            'name': 'Test Coverage',
+            'description': 'Adequate test coverage for reliability',
+            'measurement_method': 'Automated coverage analysis',
+            'threshold': 'Minimum 80% line coverage'
+        }
+    ],
+    'domain_standards': [
+        'PEP 8 style guide compliance',
+        'Python 3.9+ compatibility',
+        'Type hints for all public APIs',
+        'Comprehensive docstrings for modules and functions'
+    ]
+}
+
+# Creative Professional Example
+_CREATIVE_CONFIG = {
+    'role': 'Content Strategist',
+    'domain': 'Content Creation',
+    'expertise_level': 'advanced',
+    'primary_purpose': 'Create compelling, engaging content that resonates with target audiences and achieves business objectives',
+    'team_context': 'collaborative',
+    'work_environment': 'creative_agency',
+    'primary_tasks': [
+        'Content strategy development',
+        'Creative brief creation',
+        'Content editing and optimization',
+        'Brand voice development',
+        'Campaign ideation'
+    ],
+    'tools_available': [
+        {
+            'name': 'content_analyzer',
+            'description': 'Analyzes content performance and engagement metrics',
+            'usage_conditions': 'When evaluating content effectiveness or planning optimization',
+            'validation_requirements': 'Cross-reference with business objectives',
+            'error_procedures': 'Use manual analysis and industry benchmarks'
+        },
+        {
+            'name': 'brand_voice_checker',
+            'description': 'Validates content against brand voice guidelines',
+            'usage_conditions': 'Before finalizing any customer-facing content',
+            'validation_requirements': 'Ensure alignment with brand personality',
+            'error_procedures': 'Manual review against brand guidelines'
+        }
+    ],
+    'core_competencies': [
+        {
+            'name': 'Strategic Content Planning',
+            'description': 'Developing content strategies aligned with business goals',
+            'techniques': ['Audience research', 'Content mapping', 'Editorial calendars', 'Performance analysis'],
+            'standards': ['Clear success metrics', 'Audience-focused approach', 'Brand alignment']
+        },
+        {
+            'name': 'Creative Development',
+            'description': 'Creating original, engaging content concepts',
+            'techniques': ['Brainstorming', 'Ideation frameworks', 'Creative brief development', 'Concept testing'],
+            'standards': ['Original concepts', 'Brand-appropriate tone', 'Target audience relevance']
+        }
+    ],
+    'safety_level': 'medium',
+    'max_tool_calls': 8,
+    'max_reasoning_steps': 15,
+    'communication_style': 'creative_professional',
+    'output_format': 'structured_text',
+    'escalation_conditions': [
+        'Content conflicts with brand guidelines',
+        'Legal or compliance concerns',
+        'Client feedback requires major strategic changes'
+    ],
+    'quality_standards': [
+        {
+            'name': 'Brand Alignment',
+            'description': 'Content must align with brand voice and values',
+            'measurement_method': 'Brand voice checker and manual review',
+            'threshold': '95% alignment score'
+        }
+    ],
+    'domain_standards': [
+        'AP Style Guide compliance',
+        'Brand voice consistency',
+        'SEO best practices integration',
+        'Accessibility guidelines adherence'
+    ]
+}
+
+def create_example_configs():
+    """Create example configuration files for different agent types
     
+    Each call returns fresh copies, so callers may edit them freely.
+    """
     return {
-        'technical_specialist': technical_config,
-        'creative_professional': creative_config
+        'technical_specialist': copy.deepcopy(_TECHNICAL_CONFIG),
+        'creative_professional': copy.deepcopy(_CREATIVE_CONFIG)
     }
 
+def _requirements_from_example(config: Dict[str, Any]) -> AgentRequirements:
+    """Convert an example config dict into a requirements object"""
+    return AgentRequirements(
+        role=config['role'],
+        domain=config['domain'],
+        expertise_level=ExpertiseLevel(config['expertise_level']),
+        primary_purpose=config['primary_purpose'],
+        team_context=TeamContext(config.get('team_context', 'solo')),
+        tools_available=[Tool(**tool) for tool in config.get('tools_available', [])],
+        core_competencies=[Competency(**comp) for comp in config.get('core_competencies', [])],
+        safety_level=SafetyLevel(config.get('safety_level', 'medium')),
+        escalation_conditions=config.get('escalation_conditions', []),
+        quality_standards=[QualityStandard(**qs) for qs in config.get('quality_standards', [])],
+        domain_standards=config.get('domain_standards', [])
+    )
+
+# Example requirements are built once at import so --example is a plain lookup
+_EXAMPLE_REQUIREMENTS = {
+    name: _requirements_from_example(config)
+    for name, config in create_example_configs().items()
+}
+
+def _make_prompter():
+    """Return a prompt(message) callable suited to the current stdin"""
+    if not sys.stdin.isatty():
+        # Piped input: read every answer in one go, treating missing lines as empty
+        answers = iter(sys.stdin.read().splitlines())
+        
+        def prompt(message: str) -> str:
+            sys.stdout.write(message)
+            return next(answers, '')
+        return prompt
+    
+    try:
+        from prompt_toolkit import PromptSession
+    except ImportError:
+        return input
+    return PromptSession().prompt
+
 def interactive_mode():
     """Run interactive mode to gather requirements"""
     print("Meta-Agent Interactive Mode")
     print("=" * 30)
     
+    prompt = _make_prompter()
+    
     # Basic information
-    role = input("Agent role (e.g., 'Senior Python Developer'): ")
-    domain = input("Domain expertise (e.g., 'Software Development'): ")
-    expertise_level = input("Expertise level (beginner/intermediate/advanced/expert): ")
-    primary_purpose = input("Primary purpose: ")
+    role = prompt("Agent role (e.g., 'Senior Python Developer'): ")
+    domain = prompt("Domain expertise (e.g., 'Software Development'): ")
+    expertise_level = prompt("Expertise level (beginner/intermediate/advanced/expert): ")
+    primary_purpose = prompt("Primary purpose: ")
     
     # Context
-    team_context = input("Team context (solo/collaborative/hierarchical) [solo]: ") or "solo"
+    team_context = prompt("Team context (solo/collaborative/hierarchical) [solo]: ") or "solo"
     
     # Tools (simplified for interactive mode)
     tools = []
     print("\nTools available (press Enter with empty name to finish):")
     while True:
-        tool_name = input("Tool name: ")
+        tool_name = prompt("Tool name: ")
         if not tool_name:
             break
-        tool_desc = input("Tool description: ")
-        tool_conditions = input("Usage conditions: ")
+        tool_desc = prompt("Tool description: ")
+        tool_conditions = prompt("Usage conditions: ")
         tools.append({
             'name': tool_name,
             'description': tool_desc,
@@ -848,7 +1000,7 @@ def interactive_mode():
         })
     
     # Safety level
-    safety_level = input("Safety level (low/medium/high) [medium]: ") or "medium"
+    safety_level = prompt("Safety level (low/medium/high) [medium]: ") or "medium"
     
     # Build configuration
     config = {
@@ -868,6 +1020,28 @@ def interactive_mode():
     
     return config
 
+def write_json_report(result: Dict[str, Any], file_path: str, use_orjson: Optional[bool] = None):
+    """Write a generation result as indented JSON
+    
+    use_orjson=None uses orjson when it is installed, True requires it and
+    False always uses the stdlib json module.
+    """
+    orjson = None
+    if use_orjson is not False:
+        try:
+            import orjson
+        except ImportError:
+            if use_orjson:
+                raise
+    
+    if orjson is not None:
+        data = orjson.dumps(result, option=orjson.OPT_INDENT_2)
+    else:
+        data = json.dumps(result, indent=2, ensure_ascii=False).encode('utf-8')
+    
+    with open(file_path, 'wb') as f:
+        f.write(data)
+
 def main():
     parser = argparse.ArgumentParser(description='Meta-Agent: Generate effective agent system messages')
     parser.add_argument('--config', help='YAML configuration file path')
@@ -875,6 +1049,7 @@ def main():
     parser.add_argument('--example', choices=['technical_specialist', 'creative_professional'], 
                        help='Generate example agent configuration')
     parser.add_argument('--output', default='generated_agent.md', help='Output file path')
+    parser.add_argument('--json', help='Also write the machine-readable generation result to this JSON file')
     parser.add_argument('--validate-only', action='store_true', help='Only validate existing system message')
     
     args = parser.parse_args()
@@ -883,23 +1058,7 @@ def main():
     
     if args.example:
         # Generate example configuration
-        examples = create_example_configs()
-        config = examples[args.example]
-        
-        # Convert to requirements object
-        requirements = AgentRequirements(
-            role=config['role'],
-            domain=config['domain'],
-            expertise_level=ExpertiseLevel(config['expertise_level']),
-            primary_purpose=config['primary_purpose'],
-            team_context=TeamContext(config.get('team_context', 'solo')),
-            tools_available=[Tool(**tool) for tool in config.get('tools_available', [])],
-            core_competencies=[Competency(**comp) for comp in config.get('core_competencies', [])],
-            safety_level=SafetyLevel(config.get('safety_level', 'medium')),
-            escalation_conditions=config.get('escalation_conditions', []),
-            quality_standards=[QualityStandard(**qs) for qs in config.get('quality_standards', [])],
-            domain_standards=config.get('domain_standards', [])
-        )
+        requirements = _EXAMPLE_REQUIREMENTS[args.example]
         
     elif args.interactive:
         # Interactive mode
@@ -923,27 +1082,35 @@ def main():
         parser.print_help()
         return
     
-    # Generate system message
-    result = meta_agent.generate_system_message(requirements)
-    
-    # Write output
-    with open(args.output, 'w') as f:
-        f.write("# Generated Agent System Message\n\n")
-        f.write(result['system_message'])
-        f.write("\n\n" + "="*50 + "\n")
-        f.write("## Generation Report\n\n")
-        f.write(f"**Templates Used**: {', '.join(result['templates_used'])}\n\n")
-        f.write(f"**Complexity Score**: {result['analysis']['complexity_score']}\n\n")
-        f.write(f"**Validation Passed**: {result['validation']['overall_pass']}\n\n")
-        
-        if result['validation']['suggestions']:
-            f.write("**Improvement Suggestions**:\n")
-            for suggestion in result['validation']['suggestions']:
-                f.write(f"- {suggestion}\n")
-        
-        f.write("\n### Validation Details\n")
-        for check_name, check_result in result['validation']['checks'].items():
-            f.write(f"- **{check_name.replace('_', ' ').title()}**: {'✓' if check_result['passed'] else '✗'}\n")
+    # Generate system message; the report below always needs validation results
+    result = meta_agent.generate_system_message(requirements, validate=True)
+    
+    # Write output in a single call
+    parts = [
+        "# Generated Agent System Message\n\n",
+        result['system_message'],
+        "\n\n" + "="*50 + "\n",
+        "## Generation Report\n\n",
+        f"**Templates Used**: {', '.join(result['templates_used'])}\n\n",
+        f"**Complexity Score**: {result['analysis']['complexity_score']}\n\n",
+        f"**Validation Passed**: {result['validation']['overall_pass']}\n\n"
+    ]
+    
+    if result['validation']['suggestions']:
+        parts.append("**Improvement Suggestions**:\n")
+        parts.extend(f"- {suggestion}\n" for suggestion in result['validation']['suggestions'])
+    
+    parts.append("\n### Validation Details\n")
+    parts.extend(
+        f"- **{check_name.replace('_', ' ').title()}**: {'✓' if check_result['passed'] else '✗'}\n"
+        for check_name, check_result in result['validation']['checks'].items()
+    )
+    
+    with open(args.output, 'w', encoding='utf-8') as f:
+        f.write(''.join(parts))
+    
+    if args.json:
+        write_json_report(result, args.json)
     
     print(f"Generated agent system message saved to: {args.output}")
     print(f"Validation passed: {result['validation']['overall_pass']}")
@@ -4,21 +4,57 @@ Test suite for Meta-Agent validation and quality assessment
 """
 
 import os
+import re
 import sys
-import yaml
 import json
+import tempfile
+import dataclasses
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from meta_agent import MetaAgent, AgentRequirements, ExpertiseLevel, TeamContext, SafetyLevel, Tool, Competency, QualityStandard
+from meta_agent import MetaAgent, AgentRequirements, ExpertiseLevel, TeamContext, SafetyLevel, Tool, Competency, QualityStandard, write_json_report, read_yaml_config
+
+_WORD_PATTERN = re.compile(r"[a-z0-9_]+")
+
+def _words(message):
+    """Set of word tokens in an already lowercased message, for single-token checks"""
+    return set(_WORD_PATTERN.findall(message))
+
+def _freeze(value):
+    """Recursively turn lists into tuples so requirements can be used as a dict key"""
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    return value
 
 class MetaAgentTester:
+    # Fixtures for the maximum-complexity edge case, built once rather than per run
+    _LONG_ROLE = "A" * 200
+    _COMPLEX_TOOLS = [Tool(f"tool_{i}", f"Description {i}", f"Condition {i}") for i in range(10)]
+    _COMPLEX_COMPETENCIES = [Competency(f"Skill {i}", f"Description {i}") for i in range(5)]
+    
     def __init__(self):
         self.meta_agent = MetaAgent()
         self.test_results = {}
+        self._generation_cache = {}
     
-    def run_all_tests(self):
-        """Run comprehensive test suite"""
-        print("Running Meta-Agent Test Suite")
-        print("=" * 40)
+    def generate(self, requirements):
+        """Generate a system message, reusing the result for identical requirements"""
+        key = _freeze(dataclasses.astuple(requirements))
+        result = self._generation_cache.get(key)
+        if result is None:
+            result = self._generation_cache[key] = self.meta_agent.generate_system_message(requirements, validate=True)
+        return result
+    
+    def run_all_tests(self, verbose=False):
+        """Run comprehensive test suite
+        
+        The report is written to stdout in one go at the end; pass verbose=True
+        to print each test's result as soon as it finishes.
+        """
+        lines = []
+        report = print if verbose else lines.append
+        
+        report("Running Meta-Agent Test Suite")
+        report("=" * 40)
         
         tests = [
             self.test_basic_generation,
@@ -28,7 +64,9 @@ class MetaAgentTester:
             self.test_safety_levels,
             self.test_team_contexts,
             self.test_validation_quality,
-            self.test_edge_cases
+            self.test_edge_cases,
+            self.test_skip_validation,
+            self.test_json_report
         ]
         
         for test in tests:
@@ -36,15 +74,21 @@ class MetaAgentTester:
                 result = test()
                 test_name = test.__name__
                 self.test_results[test_name] = result
-                status = "✓ PASS" if result['passed'] else "✗ FAIL"
-                print(f"{status} {test_name}")
-                if not result['passed']:
-                    print(f"  Issues: {', '.join(result.get('issues', []))}")
+                passed = result['passed']
+                status = "✓ PASS" if passed else "✗ FAIL"
+                report(f"{status} {test_name}")
+                issues = None if passed else result.get('issues')
+                if issues:
+                    report(f"  Issues: {', '.join(issues)}")
+                if result.get('skipped'):
+                    report(f"  Skipped: {', '.join(result['skipped'])}")
             except Exception as e:
-                print(f"✗ ERROR {test.__name__}: {e}")
+                report(f"✗ ERROR {test.__name__}: {e}")
                 self.test_results[test.__name__] = {'passed': False, 'error': str(e)}
         
-        self.print_summary()
+        self.print_summary(report)
+        if lines:
+            sys.stdout.write("\n".join(lines) + "\n")
         return self.test_results
     
     def test_basic_generation(self):
@@ -56,16 +100,17 @@ class MetaAgentTester:
             primary_purpose="Test basic functionality"
         )
         
-        result = self.meta_agent.generate_system_message(requirements)
+        result = self.generate(requirements)
+        message = result['system_message'].lower()
         
         issues = []
-        if not result['system_message']:
+        if not message:
             issues.append("No system message generated")
         
-        if len(result['system_message']) < 100:
+        if len(message) < 100:
             issues.append("System message too short")
         
-        if 'constitutional' not in result['system_message'].lower():
+        if 'constitutional' not in _words(message):
             issues.append("Missing constitutional principles")
         
         return {
@@ -84,17 +129,18 @@ class MetaAgentTester:
             primary_purpose="Test constitutional compliance"
         )
         
-        result = self.meta_agent.generate_system_message(requirements)
+        result = self.generate(requirements)
         message = result['system_message'].lower()
+        words = _words(message)
         
         constitutional_principles = ['helpfulness', 'harmlessness', 'honesty', 'transparency']
-        found_principles = [p for p in constitutional_principles if p in message]
+        found_principles = [p for p in constitutional_principles if p in words]
         
         issues = []
         if len(found_principles) < 3:
             issues.append(f"Only found {len(found_principles)}/4 constitutional principles")
         
-        if 'constitutional' not in message:
+        if 'constitutional' not in words:
             issues.append("Missing explicit constitutional section")
         
         return {
@@ -121,7 +167,7 @@ class MetaAgentTester:
             ]
         )
         
-        result = self.meta_agent.generate_system_message(requirements)
+        result = self.generate(requirements)
         message = result['system_message'].lower()
         
         issues = []
@@ -167,26 +213,28 @@ class MetaAgentTester:
             tools_available=tools
         )
         
-        result = self.meta_agent.generate_system_message(requirements)
+        result = self.generate(requirements)
         message = result['system_message'].lower()
+        words = _words(message)
         
         issues = []
-        if 'ml_trainer' not in message:
+        if 'ml_trainer' not in words:
             issues.append("Tool ml_trainer not included")
         
-        if 'data_processor' not in message:
+        if 'data_processor' not in words:
             issues.append("Tool data_processor not included")
         
+        # Multi-word phrases still need a substring search
         if 'tool usage principles' not in message:
             issues.append("Tool usage guidelines missing")
         
-        if 'validation' not in message:
+        if 'validation' not in words:
             issues.append("Tool validation procedures missing")
         
         return {
             'passed': len(issues) == 0,
             'issues': issues,
-            'tools_found': [tool.name for tool in tools if tool.name in message]
+            'tools_found': [tool.name for tool in tools if tool.name in words]
         }
     
     def test_safety_levels(self):
@@ -200,16 +248,17 @@ class MetaAgentTester:
         all_passed = True
         all_issues = []
         
+        base_requirements = AgentRequirements(
+            role="Safety Test Agent",
+            domain="Testing",
+            expertise_level=ExpertiseLevel.INTERMEDIATE,
+            primary_purpose="Test safety levels"
+        )
+        
         for safety_level, expected_content in test_cases:
-            requirements = AgentRequirements(
-                role="Safety Test Agent",
-                domain="Testing",
-                expertise_level=ExpertiseLevel.INTERMEDIATE,
-                primary_purpose="Test safety levels",
-                safety_level=safety_level
-            )
+            requirements = dataclasses.replace(base_requirements, safety_level=safety_level)
             
-            result = self.meta_agent.generate_system_message(requirements)
+            result = self.generate(requirements)
             message = result['system_message'].lower()
             
             issues = []
@@ -240,16 +289,17 @@ class MetaAgentTester:
         all_passed = True
         all_issues = []
         
+        base_requirements = AgentRequirements(
+            role="Team Test Agent",
+            domain="Testing",
+            expertise_level=ExpertiseLevel.INTERMEDIATE,
+            primary_purpose="Test team contexts"
+        )
+        
         for team_context, expected_behavior in test_cases:
-            requirements = AgentRequirements(
-                role="Team Test Agent",
-                domain="Testing",
-                expertise_level=ExpertiseLevel.INTERMEDIATE,
-                primary_purpose="Test team contexts",
-                team_context=team_context
-            )
+            requirements = dataclasses.replace(base_requirements, team_context=team_context)
             
-            result = self.meta_agent.generate_system_message(requirements)
+            result = self.generate(requirements)
             message = result['system_message'].lower()
             
             issues = []
@@ -283,7 +333,7 @@ class MetaAgentTester:
             primary_purpose="Do things"  # Vague purpose
         )
         
-        result = self.meta_agent.generate_system_message(poor_requirements)
+        result = self.generate(poor_requirements)
         validation = result['validation']
         
         # Good configuration
@@ -298,7 +348,7 @@ class MetaAgentTester:
             escalation_conditions=["Architecture conflicts", "Performance requirements unclear"]
         )
         
-        good_result = self.meta_agent.generate_system_message(good_requirements)
+        good_result = self.generate(good_requirements)
         good_validation = good_result['validation']
         
         issues = []
@@ -329,7 +379,7 @@ class MetaAgentTester:
                 primary_purpose="Test edge cases",
                 tools_available=[]
             )
-            result = self.meta_agent.generate_system_message(requirements)
+            result = self.generate(requirements)
             if not result['system_message']:
                 edge_cases.append("Failed with empty tools list")
         except Exception as e:
@@ -338,12 +388,12 @@ class MetaAgentTester:
         # Very long role name
         try:
             requirements = AgentRequirements(
-                role="A" * 200,  # Very long role name
+                role=self._LONG_ROLE,  # Very long role name
                 domain="Testing",
                 expertise_level=ExpertiseLevel.EXPERT,
                 primary_purpose="Test long role names"
             )
-            result = self.meta_agent.generate_system_message(requirements)
+            result = self.generate(requirements)
             if not result['system_message']:
                 edge_cases.append("Failed with long role name")
         except Exception as e:
@@ -351,22 +401,19 @@ class MetaAgentTester:
         
         # Maximum complexity
         try:
-            complex_tools = [Tool(f"tool_{i}", f"Description {i}", f"Condition {i}") for i in range(10)]
-            complex_competencies = [Competency(f"Skill {i}", f"Description {i}") for i in range(5)]
-            
             requirements = AgentRequirements(
                 role="Complex Agent",
                 domain="Multi-domain Expert",
                 expertise_level=ExpertiseLevel.EXPERT,
                 primary_purpose="Handle maximum complexity scenarios",
                 team_context=TeamContext.HIERARCHICAL,
-                tools_available=complex_tools,
-                core_competencies=complex_competencies,
+                tools_available=self._COMPLEX_TOOLS,
+                core_competencies=self._COMPLEX_COMPETENCIES,
                 safety_level=SafetyLevel.HIGH,
                 max_tool_calls=50,
                 max_reasoning_steps=100
             )
-            result = self.meta_agent.generate_system_message(requirements)
+            result = self.generate(requirements)
             if not result['system_message']:
                 edge_cases.append("Failed with maximum complexity")
         except Exception as e:
@@ -378,29 +425,95 @@ class MetaAgentTester:
             'edge_cases_tested': 3
         }
     
-    def print_summary(self):
-        """Print test summary"""
-        print("\n" + "=" * 40)
-        print("TEST SUMMARY")
-        print("=" * 40)
+    def test_skip_validation(self):
+        """Test that validate=False skips validation without changing the message"""
+        requirements = AgentRequirements(
+            role="Fast Path Agent",
+            domain="Testing",
+            expertise_level=ExpertiseLevel.ADVANCED,
+            primary_purpose="Test generation without validation"
+        )
         
-        passed = sum(1 for result in self.test_results.values() if result.get('passed', False))
-        total = len(self.test_results)
+        validated = self.generate(requirements)
+        skipped = self.meta_agent.generate_system_message(requirements, validate=False)
         
-        print(f"Tests Passed: {passed}/{total}")
-        print(f"Success Rate: {(passed/total)*100:.1f}%")
+        issues = []
+        if skipped['validation'] is not None:
+            issues.append("Validation ran despite validate=False")
+        
+        if skipped['system_message'] != validated['system_message']:
+            issues.append("Skipping validation changed the system message")
+        
+        if skipped['templates_used'] != validated['templates_used']:
+            issues.append("Skipping validation changed the templates used")
+        
+        return {
+            'passed': len(issues) == 0,
+            'issues': issues
+        }
+    
+    def test_json_report(self):
+        """Test that JSON reports round-trip through orjson and the stdlib fallback"""
+        requirements = AgentRequirements(
+            role="Report Agent",
+            domain="Testing",
+            expertise_level=ExpertiseLevel.EXPERT,
+            primary_purpose="Test JSON report output",
+            tools_available=[Tool("report_tool", "Writes reports", "When reporting")]
+        )
+        result = self.generate(requirements)
+        
+        issues = []
+        skipped = []
+        backends = [('json fallback', False)]
+        try:
+            import orjson
+            backends.append(('orjson', True))
+        except ImportError:
+            skipped.append("orjson is not installed")
+        
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            report_path = os.path.join(tmp_dir, 'report.json')
+            
+            for backend, use_orjson in backends:
+                write_json_report(result, report_path, use_orjson=use_orjson)
+                with open(report_path, 'r', encoding='utf-8') as f:
+                    loaded = json.load(f)
+                
+                if loaded != result:
+                    issues.append(f"Report written via {backend} does not match the generation result")
+        
+        return {
+            'passed': len(issues) == 0,
+            'issues': issues,
+            'skipped': skipped
+        }
+    
+    def print_summary(self, report=print):
+        """Print test summary, one line per report() call"""
+        report("\n" + "=" * 40)
+        report("TEST SUMMARY")
+        report("=" * 40)
+        
+        passed = total = 0
+        for result in self.test_results.values():
+            total += 1
+            passed += bool(result.get('passed', False))
+        
+        report(f"Tests Passed: {passed}/{total}")
+        report(f"Success Rate: {(passed/total)*100:.1f}%")
         
         if passed == total:
-            print("🎉 All tests passed! Meta-agent is working correctly.")
+            report("🎉 All tests passed! Meta-agent is working correctly.")
         else:
-            print("⚠️  Some tests failed. Review issues above.")
+            report("⚠️  Some tests failed. Review issues above.")
         
-        print("\nDetailed Results:")
+        report("\nDetailed Results:")
         for test_name, result in self.test_results.items():
             status = "✓" if result.get('passed', False) else "✗"
-            print(f"  {status} {test_name}")
+            report(f"  {status} {test_name}")
 
-def run_comprehensive_validation():
+def run_comprehensive_validation(meta_agent=None):
     """Run comprehensive validation of generated agents"""
     print("\nRunning Comprehensive Agent Validation")
     print("=" * 50)
@@ -412,14 +525,21 @@ def run_comprehensive_validation():
         print("Config examples directory not found")
         return
     
-    meta_agent = MetaAgent()
+    if meta_agent is None:
+        meta_agent = MetaAgent()
+    
+    with os.scandir(config_dir) as entries:
+        config_files = [entry for entry in entries if entry.name.endswith('.yaml') and entry.is_file()]
+    
+    # Read and parse every file concurrently; errors surface per file below
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        loaded = [(entry, executor.submit(read_yaml_config, entry.path)) for entry in config_files]
     
-    for config_file in config_dir.glob("*.yaml"):
+    for config_file, future in loaded:
         print(f"\nValidating {config_file.name}...")
         
         try:
-            with open(config_file, 'r') as f:
-                config = yaml.safe_load(f)
+            config = future.result()
             
             # Convert to requirements (simplified)
             requirements = AgentRequirements(
@@ -429,10 +549,12 @@ def run_comprehensive_validation():
                 primary_purpose=config['primary_purpose']
             )
             
-            result = meta_agent.generate_system_message(requirements)
+            result = meta_agent.generate_system_message(requirements, validate=True)
             
-            validation_score = sum(1 for check in result['validation']['checks'].values() if check['passed'])
-            total_checks = len(result['validation']['checks'])
+            validation_score = total_checks = 0
+            for check in result['validation']['checks'].values():
+                total_checks += 1
+                validation_score += check['passed']
             
             print(f"  Validation Score: {validation_score}/{total_checks}")
             print(f"  Overall Pass: {result['validation']['overall_pass']}")
@@ -446,12 +568,13 @@ def run_comprehensive_validation():
 if __name__ == "__main__":
     # Run tests
     tester = MetaAgentTester()
-    test_results = tester.run_all_tests()
+    test_results = tester.run_all_tests(verbose='--verbose' in sys.argv[1:])
     
     # Run comprehensive validation if config examples exist
     if os.path.exists("config_examples"):
-        run_comprehensive_validation()
+        run_comprehensive_validation(tester.meta_agent)
     
     # Exit with appropriate code
-    all_passed = all(result.get('passed', False) for result in test_results.values())
-    sys.exit(0 if all_passed else 1)
\ No newline at end of file
+    # Stop scanning at the first failed test
+    any_failed = any(not result.get('passed', False) for result in test_results.values())
+    sys.exit(1 if any_failed else 0)
\ No newline at end of file